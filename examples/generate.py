@@ -67,6 +67,13 @@ Examples:
         action="store_true",
         help="Disable video generation (much faster for large scale generation)"
     )
+    parser.add_argument(
+        "--video-codec",
+        type=str,
+        choices=["mjpeg", "mp4v"],
+        default="mjpeg",
+        help="Video codec: mjpeg is fastest to encode (default), mp4v gives smaller .mp4 files"
+    )
     
     # Random scaling parameters
     parser.add_argument(
@@ -124,6 +131,7 @@ Examples:
         random_seed=args.seed,
         output_dir=Path(args.output),
         generate_videos=not args.no_videos,
+        video_codec=args.video_codec,
         grid_size_min=args.grid_min,
         grid_size_max=args.grid_max,
         num_blocks_min=args.blocks_min,
@@ -132,16 +140,14 @@ Examples:
         steps_max=args.steps_max,
     )
     
-    # Generate tasks
+    # Generate tasks, streaming each one to disk as it completes so
+    # memory use stays flat even for millions of samples
     generator = TaskGenerator(config)
-    tasks = generator.generate_dataset()
-    
-    # Write to disk
     writer = OutputWriter(Path(args.output))
-    writer.write_dataset(tasks)
-    
+    num_tasks = generator.stream_dataset(writer)
+
     print()
-    print(f"✅ Done! Generated {len(tasks):,} unique tasks in {args.output}/{config.domain}_task/")
+    print(f"✅ Done! Generated {num_tasks:,} unique tasks in {args.output}/{config.domain}_task/")
     print(f"   Each task has randomized: grid size, block count, steps, direction, color, and positions.")
     print(f"   Prompts contain 50-100 words with detailed instructions.")
 
@@ -5,10 +5,34 @@ This module contains the grid shift task generator:
     - config.py   : Grid shift task configuration (TaskConfig)
     - generator.py: Grid shift task generation logic (TaskGenerator)
     - prompts.py  : Grid shift task prompts/instructions (get_prompt)
+
+Submodules are imported lazily on first attribute access, so e.g.
+``from src import get_prompt`` does not pull in the rendering and video
+stack (numpy, cv2, PIL, pydantic) that TaskGenerator needs.
 """
 
-from .config import TaskConfig
-from .generator import TaskGenerator
-from .prompts import get_prompt
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .config import TaskConfig
+    from .generator import TaskGenerator
+    from .prompts import get_prompt
 
 __all__ = ["TaskConfig", "TaskGenerator", "get_prompt"]
+
+# Exported name -> submodule providing it
+_SUBMODULES = {
+    "TaskConfig": ".config",
+    "TaskGenerator": ".generator",
+    "get_prompt": ".prompts",
+}
+
+
+def __getattr__(name: str):
+    if name in _SUBMODULES:
+        from importlib import import_module
+
+        value = getattr(import_module(_SUBMODULES[name], __name__), name)
+        globals()[name] = value  # cache so __getattr__ runs once per name
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
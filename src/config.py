@@ -7,7 +7,7 @@
 ╚══════════════════════════════════════════════════════════════════════════════╝
 """
 
-from pydantic import Field
+from pydantic import ConfigDict, Field
 from core import GenerationConfig
 
 
@@ -23,7 +23,17 @@ class TaskConfig(GenerationConfig):
         - output_dir: Path          # Where to save outputs
         - image_size: tuple[int, int] # Image dimensions
     """
-    
+
+    # Validate once on creation and never again: instances are not copied
+    # or re-validated when passed between components (e.g. per-worker
+    # generators) and assignments skip validation; unknown fields are
+    # rejected up front so typos fail fast instead of silently riding along.
+    model_config = ConfigDict(
+        revalidate_instances="never",
+        validate_assignment=False,
+        extra="forbid",
+    )
+
     # ══════════════════════════════════════════════════════════════════════════
     #  OVERRIDE DEFAULTS
     # ══════════════════════════════════════════════════════════════════════════
@@ -44,6 +54,12 @@ class TaskConfig(GenerationConfig):
         default=10,
         description="Video frame rate"
     )
+
+    video_codec: str = Field(
+        default="mjpeg",
+        description="Video codec: 'mjpeg' (fastest to encode, .avi container) "
+                    "or 'mp4v' (smaller files, .mp4 container)"
+    )
     
     # ══════════════════════════════════════════════════════════════════════════
     #  TASK-SPECIFIC SETTINGS (Random Scaling)
@@ -7,13 +7,21 @@
 ╚══════════════════════════════════════════════════════════════════════════════╝
 """
 
+import multiprocessing
+import os
 import random
 import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Tuple, Optional, Dict, Any
-from PIL import Image, ImageDraw
+from typing import Iterable, Iterator, List, Tuple, Optional, Dict, Any
 
-from core import BaseGenerator, TaskPair, ImageRenderer
+import cv2
+import numpy as np
+from PIL import Image
+
+from core import BaseGenerator, TaskPair, ImageRenderer, OutputWriter
 from core.video_utils import VideoGenerator
 from .config import TaskConfig
 from .prompts import get_prompt
@@ -27,6 +35,147 @@ DIRECTIONS = {
 }
 COLORS = ["red", "green", "blue", "yellow", "orange", "purple"]
 
+# Block fill colors, keyed by lowercase name (RGB; the video writer
+# converts to BGR on write). Built once so renders do a plain dict lookup.
+COLOR_MAP = {
+    "red": (220, 53, 69),
+    "green": (40, 167, 69),
+    "blue": (0, 123, 255),
+    "yellow": (255, 193, 7),
+    "orange": (255, 152, 0),
+    "purple": (108, 117, 125),
+}
+DEFAULT_BLOCK_COLOR = COLOR_MAP["blue"]
+
+
+def _difficulty_from_score(score: int) -> str:
+    """Map a 0-6 difficulty score to its label."""
+    if score <= 1:
+        return "easy"
+    elif score <= 3:
+        return "medium"
+    elif score <= 5:
+        return "hard"
+    else:
+        return "expert"
+
+
+# Difficulty label for every (grid_bucket, blocks_bucket, steps_bucket)
+# combination; each bucket contributes 0-2 to the score. Enumerated once
+# so per-task difficulty is a single lookup.
+DIFFICULTY_TABLE = {
+    (g, b, s): _difficulty_from_score(g + b + s)
+    for g in range(3)
+    for b in range(3)
+    for s in range(3)
+}
+
+# Codec name -> (cv2 fourcc, container extension). MJPEG encodes these
+# flat-color frames far faster than mp4v and is the default for
+# ground-truth (draft) videos.
+VIDEO_CODECS = {
+    "mjpeg": ("MJPG", ".avi"),
+    "mp4v": ("mp4v", ".mp4"),
+}
+
+
+@lru_cache(maxsize=None)
+def _grid_background(grid_size: int, image_size: int) -> np.ndarray:
+    """
+    White background with grid lines for a given grid size.
+
+    The background is identical for every frame of every task with the
+    same grid size, and grid_size spans a handful of values, so it is
+    rendered once and cached; callers copy it instead of redrawing the
+    lines. The cached array is marked read-only to catch accidental
+    in-place edits.
+    """
+    img = np.full((image_size, image_size, 3), 255, dtype=np.uint8)
+    cell_size = image_size / grid_size
+
+    grid_color = (51, 51, 51)  # Dark gray
+    for i in range(grid_size + 1):
+        x = int(i * cell_size)
+        cv2.line(img, (x, 0), (x, image_size), grid_color, 1)
+        cv2.line(img, (0, x), (image_size, x), grid_color, 1)
+
+    img.flags.writeable = False
+    return img
+
+
+@lru_cache(maxsize=None)
+def _block_rects(grid_size: int, image_size: int) -> np.ndarray:
+    """
+    Pixel rectangles (x0, y0, x1, y1) for a block in every grid cell.
+
+    Shaped (grid_size, grid_size, 4) and indexed [row, col]; precomputed
+    once per grid size so integer-position renders skip the per-block
+    coordinate arithmetic.
+    """
+    cell_size = image_size / grid_size
+    padding = 0.08  # Padding inside each cell (8% of cell size)
+    block_size = cell_size * (1 - 2 * padding)
+    pad_px = cell_size * padding
+
+    rects = np.empty((grid_size, grid_size, 4), dtype=np.int32)
+    for row in range(grid_size):
+        y = row * cell_size + pad_px
+        for col in range(grid_size):
+            x = col * cell_size + pad_px
+            rects[row, col] = (int(x), int(y), int(x + block_size), int(y + block_size))
+
+    rects.flags.writeable = False
+    return rects
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  PARALLEL GENERATION WORKERS
+# ══════════════════════════════════════════════════════════════════════════════
+
+# Per-worker generator instance, built once per process so each task
+# doesn't pay the setup cost. Module-level so workers can reach it.
+_worker_generator: Optional["TaskGenerator"] = None
+
+# Config slot for fork-based pools: the parent stores its (already
+# validated) config here before forking and children inherit it with the
+# address space, so nothing is pickled per worker.
+_fork_config: Optional[TaskConfig] = None
+
+
+def _init_fork_worker() -> None:
+    """Build the per-process TaskGenerator from the inherited config."""
+    global _worker_generator
+    _worker_generator = TaskGenerator(_fork_config)
+
+
+def _init_spawn_worker(config_dict: dict) -> None:
+    """Build the per-process TaskGenerator from the parent's dumped config.
+
+    The parent already validated the config; model_construct rebuilds it
+    from the dumped fields without re-running pydantic validation.
+    """
+    global _worker_generator
+    _worker_generator = TaskGenerator(TaskConfig.model_construct(**config_dict))
+
+
+def _generate_one(task_index: int) -> TaskPair:
+    """Generate a single task pair inside a worker process.
+
+    Each task derives its own RNG state from (random_seed ^ task_index) so
+    results are reproducible regardless of how tasks are distributed
+    across workers.
+    """
+    config = _worker_generator.config
+    if config.random_seed is not None:
+        _worker_generator.rng.seed(config.random_seed ^ task_index)
+    task_id = f"{config.domain}_{task_index:04d}"
+    return _worker_generator.generate_task_pair(task_id)
+
+
+def _generate_chunk(task_indices: Iterable[int]) -> List[TaskPair]:
+    """Generate a chunk of task pairs inside a worker process."""
+    return [_generate_one(i) for i in task_indices]
+
 
 class TaskGenerator(BaseGenerator):
     """
@@ -46,6 +195,10 @@ class TaskGenerator(BaseGenerator):
     def __init__(self, config: TaskConfig):
         super().__init__(config)
         self.renderer = ImageRenderer(image_size=config.image_size)
+
+        # Private RNG so parallel workers can reseed per task without
+        # touching (or racing on) the module-global random state
+        self.rng = random.Random(config.random_seed)
         
         # Initialize video generator if enabled (using mp4 format)
         self.video_generator = None
@@ -59,26 +212,42 @@ class TaskGenerator(BaseGenerator):
         self.num_blocks_max_ratio = config.num_blocks_max_ratio
         self.steps_min = config.steps_min
         self.steps_max = config.steps_max
+
+        # Preallocated buffers for _sample_indices, sized for the largest
+        # grid: an identity index pool plus the swap targets needed to
+        # undo each draw, so sampling never allocates per task
+        max_cells = self.grid_size_max * self.grid_size_max
+        self._index_pool = list(range(max_cells))
+        self._swap_targets = [0] * max_cells
     
     def generate_task_pair(self, task_id: str) -> TaskPair:
         """Generate one grid shift task pair."""
         
         # Generate task data
         task_data = self._generate_task_data()
-        
-        # Render images
-        first_image = self._render_initial_state(task_data)
-        final_image = self._render_final_state(task_data)
-        
+
+        # Render initial/final states once; the video path reuses the same
+        # arrays for its hold frames instead of re-rendering them
+        first_frame = self._render_grid_array(
+            task_data["positions"], task_data["color"], task_data["grid_size"]
+        )
+        final_frame = self._render_grid_array(
+            task_data["shifted_positions"], task_data["color"], task_data["grid_size"]
+        )
+        first_image = Image.fromarray(first_frame)
+        final_image = Image.fromarray(final_frame)
+
         # Generate video (optional)
         video_path = None
         if self.config.generate_videos and self.video_generator:
-            video_path = self._generate_video(first_image, final_image, task_id, task_data)
+            video_path = self._generate_video(first_frame, final_frame, task_id, task_data)
         
         # Select prompt
-        prompt = get_prompt(task_data.get("type", "default"), task_data)
+        prompt = get_prompt(task_data.get("type", "default"), task_data, rng=self.rng)
         
-        return TaskPair(
+        # All fields are produced locally with the right types, so skip
+        # pydantic validation on this per-task hot path
+        return TaskPair.model_construct(
             task_id=task_id,
             domain=self.config.domain,
             prompt=prompt,
@@ -86,7 +255,94 @@ class TaskGenerator(BaseGenerator):
             final_image=final_image,
             ground_truth_video=video_path
         )
-    
+
+    def generate_dataset(self) -> List[TaskPair]:
+        """Generate complete dataset, parallelized across CPU cores."""
+        pairs = []
+        for pair in self._iter_task_pairs():
+            pairs.append(pair)
+            print(f"  Generated: {pair.task_id}")
+        return pairs
+
+    def stream_dataset(self, writer: OutputWriter) -> int:
+        """Generate the dataset, writing each task to disk as it completes.
+
+        Unlike generate_dataset, finished TaskPairs (and their PIL images)
+        are released as soon as they are written, so peak memory is
+        bounded by the pool's in-flight window rather than growing with
+        num_samples. Returns the number of tasks written.
+        """
+        count = 0
+        for pair in self._iter_task_pairs():
+            writer.write_task_pair(pair)
+            count += 1
+            print(f"  Generated: {pair.task_id}")
+        return count
+
+    def _iter_task_pairs(self) -> Iterator[TaskPair]:
+        """Yield task pairs in index order, parallelized across CPU cores.
+
+        Each task is independent (two rendered images plus an optional
+        video), so the work is farmed out to a ProcessPoolExecutor. Falls
+        back to serial generation for trivial workloads.
+        """
+        max_workers = os.cpu_count() or 1
+        if max_workers == 1 or self.config.num_samples < 2 * max_workers:
+            for i in range(self.config.num_samples):
+                # Reseed per index exactly like _generate_one so seeded
+                # output is identical whether a run lands on the serial
+                # or the parallel path (i.e. independent of CPU count)
+                if self.config.random_seed is not None:
+                    self.rng.seed(self.config.random_seed ^ i)
+                yield self.generate_task_pair(f"{self.config.domain}_{i:04d}")
+            return
+
+        # Prefer fork: children inherit the validated config (and warm
+        # render caches) from the parent's address space instead of
+        # re-importing and rebuilding state from a pickled dump.
+        if "fork" in multiprocessing.get_all_start_methods():
+            global _fork_config
+            _fork_config = self.config
+            pool_kwargs = {
+                "mp_context": multiprocessing.get_context("fork"),
+                "initializer": _init_fork_worker,
+            }
+        else:
+            pool_kwargs = {
+                "initializer": _init_spawn_worker,
+                "initargs": (self.config.model_dump(),),
+            }
+
+        num_samples = self.config.num_samples
+        chunksize = max(1, min(64, num_samples // (max_workers * 4)))
+
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            **pool_kwargs,
+        ) as executor:
+            # Executor.map submits every chunk up front with no
+            # backpressure, so finished TaskPairs pile up in resolved
+            # futures whenever the consumer is slower than the pool.
+            # Keep a bounded window of in-flight chunks instead, topping
+            # it up only as results are drained.
+            starts = iter(range(0, num_samples, chunksize))
+            pending = deque()
+
+            def submit_next() -> None:
+                start = next(starts, None)
+                if start is not None:
+                    stop = min(start + chunksize, num_samples)
+                    pending.append(
+                        executor.submit(_generate_chunk, range(start, stop))
+                    )
+
+            for _ in range(max_workers * 2):
+                submit_next()
+            while pending:
+                chunk = pending.popleft().result()
+                submit_next()
+                yield from chunk
+
     # ══════════════════════════════════════════════════════════════════════════
     #  TASK-SPECIFIC METHODS
     # ══════════════════════════════════════════════════════════════════════════
@@ -97,21 +353,21 @@ class TaskGenerator(BaseGenerator):
         
         for attempt in range(max_attempts):
             # 1. Randomly select grid size
-            grid_size = random.randint(self.grid_size_min, self.grid_size_max)
+            grid_size = self.rng.randint(self.grid_size_min, self.grid_size_max)
             
             # 2. Randomly select number of blocks (limited by grid size)
             max_blocks_by_size = max(
                 self.num_blocks_min,
                 int(grid_size * grid_size * self.num_blocks_max_ratio)
             )
-            num_blocks = random.randint(
+            num_blocks = self.rng.randint(
                 self.num_blocks_min,
                 min(max_blocks_by_size, grid_size * grid_size - 1)  # Leave at least 1 empty cell
             )
             
             # 3. Randomly select direction and color
-            direction = random.choice(list(DIRECTIONS.keys()))
-            color = random.choice(COLORS)
+            direction = self.rng.choice(list(DIRECTIONS.keys()))
+            color = self.rng.choice(COLORS)
             
             # 4. Randomly select steps (limited by grid size and direction)
             # Maximum steps cannot exceed grid_size - 1 (to ensure valid positions exist)
@@ -119,18 +375,28 @@ class TaskGenerator(BaseGenerator):
             if max_valid_steps < self.steps_min:
                 max_valid_steps = self.steps_min
             
-            steps = random.randint(self.steps_min, max_valid_steps)
-            
-            # 5. Get valid starting positions (positions that won't go out of bounds)
-            valid_positions = self._get_valid_positions(grid_size, direction, steps)
+            steps = self.rng.randint(self.steps_min, max_valid_steps)
             
+            # 5. Get bounds of valid starting positions (positions that
+            #    won't go out of bounds when shifted)
+            row_start, row_stop, col_start, col_stop = self._valid_position_bounds(
+                grid_size, direction, steps
+            )
+            num_cols = col_stop - col_start
+            num_valid = (row_stop - row_start) * num_cols
+
             # 6. Check if we have enough valid positions
-            if len(valid_positions) < num_blocks:
+            if num_valid < num_blocks:
                 # Try again with different parameters
                 continue
-            
-            # 7. Randomly sample positions
-            positions = random.sample(valid_positions, num_blocks)
+
+            # 7. Randomly sample positions (as flat indices into the valid
+            #    rectangle, avoiding materializing all valid positions)
+            indices = self._sample_indices(num_valid, num_blocks)
+            positions = [
+                (row_start + idx // num_cols, col_start + idx % num_cols)
+                for idx in indices
+            ]
             
             # 8. Calculate shifted positions
             dr, dc = DIRECTIONS[direction]
@@ -159,78 +425,56 @@ class TaskGenerator(BaseGenerator):
     
     def _calculate_difficulty(self, grid_size: int, num_blocks: int, steps: int) -> str:
         """Calculate difficulty level based on task parameters."""
-        # Simple difficulty scoring
-        score = 0
-        
-        # Larger grid = harder
-        if grid_size >= 10:
-            score += 2
-        elif grid_size >= 8:
-            score += 1
-        
-        # More blocks = harder
-        if num_blocks >= 5:
-            score += 2
-        elif num_blocks >= 4:
-            score += 1
-        
-        # More steps = harder
-        if steps >= 3:
-            score += 2
-        elif steps >= 2:
-            score += 1
-        
-        if score <= 1:
-            return "easy"
-        elif score <= 3:
-            return "medium"
-        elif score <= 5:
-            return "hard"
-        else:
-            return "expert"
+        grid_bucket = 2 if grid_size >= 10 else 1 if grid_size >= 8 else 0
+        blocks_bucket = 2 if num_blocks >= 5 else 1 if num_blocks >= 4 else 0
+        steps_bucket = 2 if steps >= 3 else 1 if steps >= 2 else 0
+        return DIFFICULTY_TABLE[grid_bucket, blocks_bucket, steps_bucket]
     
-    def _get_valid_positions(self, grid_size: int, direction: str, steps: int) -> List[Tuple[int, int]]:
-        """Get valid starting positions that won't go out of bounds when shifted."""
+    def _sample_indices(self, num_valid: int, num_blocks: int) -> List[int]:
+        """
+        Sample num_blocks distinct indices from range(num_valid).
+
+        Performs the first num_blocks swaps of a Fisher-Yates shuffle on
+        the generator's preallocated identity pool, copies the picks out,
+        then undoes the swaps in reverse so the pool is back to identity
+        for the next draw. O(num_blocks) work per draw; the only
+        allocation is the returned list.
+        """
+        pool = self._index_pool
+        swaps = self._swap_targets
+        for i in range(num_blocks):
+            j = self.rng.randrange(i, num_valid)
+            pool[i], pool[j] = pool[j], pool[i]
+            swaps[i] = j
+        picks = pool[:num_blocks]
+        for i in range(num_blocks - 1, -1, -1):
+            j = swaps[i]
+            pool[i], pool[j] = pool[j], pool[i]
+        return picks
+
+    def _valid_position_bounds(
+        self, grid_size: int, direction: str, steps: int
+    ) -> Tuple[int, int, int, int]:
+        """
+        Get bounds of starting positions that stay in the grid when shifted.
+
+        Returns (row_start, row_stop, col_start, col_stop) half-open
+        ranges; valid positions form a rectangle, so the bounds fully
+        describe them without materializing a position list.
+        """
         dr, dc = DIRECTIONS[direction]
-        
-        # Calculate valid row range
-        if dr == -1:  # up
-            row_range = range(steps, grid_size)
-        elif dr == 1:  # down
-            row_range = range(0, grid_size - steps)
-        else:
-            row_range = range(0, grid_size)
-        
-        # Calculate valid column range
-        if dc == -1:  # left
-            col_range = range(steps, grid_size)
-        elif dc == 1:  # right
-            col_range = range(0, grid_size - steps)
-        else:
-            col_range = range(0, grid_size)
-        
-        return [(r, c) for r in row_range for c in col_range]
-    
-    def _render_initial_state(self, task_data: dict) -> Image.Image:
-        """Render initial grid state with blocks."""
-        return self._render_grid(
-            task_data["positions"], 
-            task_data["color"],
-            task_data["grid_size"]
-        )
-    
-    def _render_final_state(self, task_data: dict) -> Image.Image:
-        """Render final grid state with shifted blocks."""
-        return self._render_grid(
-            task_data["shifted_positions"], 
-            task_data["color"],
-            task_data["grid_size"]
-        )
+
+        row_start = steps if dr == -1 else 0                          # up
+        row_stop = grid_size - steps if dr == 1 else grid_size        # down
+        col_start = steps if dc == -1 else 0                          # left
+        col_stop = grid_size - steps if dc == 1 else grid_size        # right
+
+        return row_start, row_stop, col_start, col_stop
     
     def _generate_video(
         self,
-        first_image: Image.Image,
-        final_image: Image.Image,
+        first_frame: np.ndarray,
+        final_frame: np.ndarray,
         task_id: str,
         task_data: dict
     ) -> str:
@@ -238,60 +482,112 @@ class TaskGenerator(BaseGenerator):
         temp_dir = Path(tempfile.gettempdir()) / f"{self.config.domain}_videos"
         temp_dir.mkdir(parents=True, exist_ok=True)
         video_path = temp_dir / f"{task_id}_ground_truth.mp4"
-        
-        # Create animation frames with blocks sliding
-        frames = self._create_grid_shift_animation_frames(task_data)
-        
-        result = self.video_generator.create_video_from_frames(
-            frames,
-            video_path
-        )
-        
+
+        # Create animation frames with blocks sliding (rendered as ndarrays)
+        frames = self._create_grid_shift_animation_frames(task_data, first_frame, final_frame)
+
+        result = self._write_video_frames(frames, video_path)
+
         return str(result) if result else None
+
+    def _write_video_frames(self, frames: List[np.ndarray], output_path: Path) -> Path:
+        """
+        Write RGB ndarray frames straight into the video container.
+
+        VideoGenerator.create_video_from_frames expects PIL images and
+        re-converts each one to an ndarray before encoding; frames here
+        are already ndarrays, so only the RGB->BGR conversion remains.
+        """
+        if not frames:
+            raise ValueError("No frames provided")
+
+        fourcc_name, extension = VIDEO_CODECS.get(
+            self.config.video_codec, VIDEO_CODECS["mp4v"]
+        )
+
+        height, width = frames[0].shape[:2]
+        output_path = Path(output_path).with_suffix(extension)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+
+        fourcc = cv2.VideoWriter_fourcc(*fourcc_name)
+        writer = cv2.VideoWriter(
+            str(output_path),
+            fourcc,
+            self.config.video_fps,
+            (width, height)
+        )
+
+        for frame in frames:
+            writer.write(cv2.cvtColor(frame, cv2.COLOR_RGB2BGR))
+
+        writer.release()
+        return output_path
     
     def _create_grid_shift_animation_frames(
         self,
         task_data: dict,
+        first_frame: np.ndarray,
+        final_frame: np.ndarray,
         hold_frames: int = 5,
         transition_frames: int = 25
     ) -> list:
         """
         Create animation frames where all blocks slide smoothly from start to end positions.
-        
+
         All blocks move together in the same direction with the same speed.
+        The already-rendered initial/final state arrays are reused as the
+        hold frames rather than re-rendered.
         """
         frames = []
         positions = task_data["positions"]
         shifted_positions = task_data["shifted_positions"]
         color = task_data["color"]
-        
+
         grid_size = task_data["grid_size"]
-        
+
         # Hold initial position
-        first_frame = self._render_grid(positions, color, grid_size)
         for _ in range(hold_frames):
             frames.append(first_frame)
         
-        # Create transition frames with blocks sliding
+        # Create transition frames with blocks sliding. Interpolate every
+        # block position for every frame in one broadcast instead of a
+        # per-frame Python loop: (F, 1, 1) progress against (B, 2) endpoints.
+        start = np.asarray(positions, dtype=np.float64)
+        end = np.asarray(shifted_positions, dtype=np.float64)
+        if transition_frames > 1:
+            progress = np.linspace(0.0, 1.0, transition_frames)
+        else:
+            progress = np.ones(1)
+        all_positions = start + (end - start) * progress[:, None, None]  # (F, B, 2)
+
+        # Pixel rectangles for every frame and block at once: (F, B, 4)
         image_size = self.config.image_size[0]
         cell_size = image_size / grid_size
-        
-        for i in range(transition_frames):
-            progress = i / (transition_frames - 1) if transition_frames > 1 else 1.0
-            
-            # Interpolate positions for each block
-            intermediate_positions = []
-            for (r1, c1), (r2, c2) in zip(positions, shifted_positions):
-                r = r1 + (r2 - r1) * progress
-                c = c1 + (c2 - c1) * progress
-                intermediate_positions.append((r, c))
-            
-            # Render frame with blocks at intermediate positions
-            frame = self._render_grid(intermediate_positions, color, grid_size)
-            frames.append(frame)
-        
+        padding = 0.08  # Padding inside each cell (8% of cell size)
+        block_size = cell_size * (1 - 2 * padding)
+        pad_px = cell_size * padding
+
+        xy = all_positions[:, :, ::-1] * cell_size + pad_px  # (row, col) -> (x, y)
+        rects = np.concatenate(
+            [xy.astype(np.int32), (xy + block_size).astype(np.int32)], axis=2
+        )
+
+        # Render the whole transition into one contiguous (F, H, W, 3)
+        # batch; the background is broadcast-copied into all frames at once
+        batch = np.empty(
+            (transition_frames, image_size, image_size, 3), dtype=np.uint8
+        )
+        batch[:] = _grid_background(grid_size, image_size)
+
+        block_color = COLOR_MAP.get(color, DEFAULT_BLOCK_COLOR)
+        for frame, frame_rects in zip(batch, rects):
+            for x0, y0, x1, y1 in frame_rects:
+                cv2.rectangle(frame, (x0, y0), (x1, y1), block_color, -1)
+                cv2.rectangle(frame, (x0, y0), (x1, y1), (0, 0, 0), 2)
+
+        frames.extend(batch)
+
         # Hold final position
-        final_frame = self._render_grid(shifted_positions, color, grid_size)
         for _ in range(hold_frames):
             frames.append(final_frame)
         
@@ -301,10 +597,16 @@ class TaskGenerator(BaseGenerator):
     #  GRID RENDERING
     # ══════════════════════════════════════════════════════════════════════════
     
-    def _render_grid(self, positions: List[Tuple[float, float]], color: str, grid_size: int) -> Image.Image:
+    def _render_grid_array(
+        self, positions: List[Tuple[float, float]], color: str, grid_size: int
+    ) -> np.ndarray:
         """
-        Render a grid with blocks at specified positions.
-        
+        Render a grid with blocks into an RGB uint8 ndarray.
+
+        Drawing on a preallocated numpy buffer with cv2 is several times
+        faster than per-frame PIL Image/ImageDraw allocation, which matters
+        for the ~35 animation frames rendered per task.
+
         Args:
             positions: List of (row, col) tuples (can be float for animation)
             color: Color name (e.g., "red", "blue")
@@ -312,49 +614,37 @@ class TaskGenerator(BaseGenerator):
         """
         image_size = self.config.image_size[0]
         cell_size = image_size / grid_size
-        
-        # Create image with white background
-        img = Image.new("RGB", (image_size, image_size), color="white")
-        draw = ImageDraw.Draw(img)
-        
-        # Draw grid lines
-        grid_color = (51, 51, 51)  # Dark gray
-        for i in range(grid_size + 1):
-            x = int(i * cell_size)
-            draw.line([(x, 0), (x, image_size)], fill=grid_color, width=1)
-            draw.line([(0, x), (image_size, x)], fill=grid_color, width=1)
-        
-        # Color mapping
-        color_map = {
-            "red": (220, 53, 69),
-            "green": (40, 167, 69),
-            "blue": (0, 123, 255),
-            "yellow": (255, 193, 7),
-            "orange": (255, 152, 0),
-            "purple": (108, 117, 125),
-        }
-        block_color = color_map.get(color.lower(), (0, 123, 255))  # Default to blue
-        
-        # Draw blocks
+
+        # Start from the cached grid-lines background (single memcpy)
+        img = _grid_background(grid_size, image_size).copy()
+
+        # Color names come from COLORS and are already lowercase
+        block_color = COLOR_MAP.get(color, DEFAULT_BLOCK_COLOR)
+
+        # Precompute block geometry outside the loop
         padding = 0.08  # Padding inside each cell (8% of cell size)
         block_size = cell_size * (1 - 2 * padding)
-        
+        pad_px = cell_size * padding
+        rects = _block_rects(grid_size, image_size)
+
         for row, col in positions:
-            # Convert grid coordinates to pixel coordinates
-            # Note: row 0 is at the top, row increases downward
-            x = col * cell_size + cell_size * padding
-            y = row * cell_size + cell_size * padding
-            
-            # Draw block with black border
-            x0, y0 = int(x), int(y)
-            x1, y1 = int(x + block_size), int(y + block_size)
-            
-            # Draw block
-            draw.rectangle(
-                [(x0, y0), (x1, y1)],
-                fill=block_color,
-                outline=(0, 0, 0),
-                width=2
-            )
-        
+            if isinstance(row, int) and isinstance(col, int):
+                # Grid-aligned block: use the precomputed rectangle
+                x0, y0, x1, y1 = rects[row, col]
+            else:
+                # Animation frames pass fractional (row, col) positions
+                # Note: row 0 is at the top, row increases downward
+                x = col * cell_size + pad_px
+                y = row * cell_size + pad_px
+                x0, y0 = int(x), int(y)
+                x1, y1 = int(x + block_size), int(y + block_size)
+
+            # Filled block, then black border on top
+            cv2.rectangle(img, (x0, y0), (x1, y1), block_color, -1)
+            cv2.rectangle(img, (x0, y0), (x1, y1), (0, 0, 0), 2)
+
         return img
+
+    def _render_grid(self, positions: List[Tuple[float, float]], color: str, grid_size: int) -> Image.Image:
+        """Render a grid with blocks as a PIL image (see _render_grid_array)."""
+        return Image.fromarray(self._render_grid_array(positions, color, grid_size))
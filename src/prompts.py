@@ -7,6 +7,7 @@
 """
 
 import random
+from functools import lru_cache
 
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -40,50 +41,78 @@ PROMPTS = {
 }
 
 
-def get_prompt(task_type: str = "default", task_data: dict = None) -> str:
+@lru_cache(maxsize=None)
+def _format_prompt(
+    template_index: int,
+    grid_size: int,
+    num_blocks: int,
+    color: str,
+    direction: str,
+    steps: int,
+) -> str:
+    """
+    Format a prompt template for the given task parameters.
+
+    Task parameters repeat heavily across a dataset (small discrete
+    ranges), so formatted prompts are memoized rather than re-parsing the
+    template's format string every call.
+    """
+    template = PROMPT_TEMPLATES[template_index]
+    step_word = "step" if steps == 1 else "steps"
+    cell_word = "cell" if steps == 1 else "cells"
+
+    # Get direction descriptions
+    direction_description, direction_name = DIRECTION_DESCRIPTIONS.get(
+        direction, ("unknown", "unknown")
+    )
+
+    return template.format(
+        grid_size=grid_size,
+        num_blocks=num_blocks,
+        color=color,
+        steps=steps,
+        step_word=step_word,
+        cell_word=cell_word,
+        direction=direction,
+        direction_description=direction_description,
+        direction_name=direction_name
+    )
+
+
+def get_prompt(
+    task_type: str = "default",
+    task_data: dict = None,
+    rng: random.Random = None,
+) -> str:
     """
     Select a prompt for the grid shift task.
-    
+
     Args:
         task_type: Type of task (should be "grid_shift" or "default")
         task_data: Task data dictionary containing direction, steps, grid_size, num_blocks, color, etc.
-        
+        rng: Optional random.Random instance; defaults to the module-global
+            RNG (pass a per-generator RNG for reproducible parallel runs)
+
     Returns:
         Formatted prompt string
     """
+    if rng is None:
+        rng = random
     if task_data and "direction" in task_data and "steps" in task_data:
-        # Format prompt with task-specific values
-        template = random.choice(PROMPT_TEMPLATES)
-        steps = task_data["steps"]
-        step_word = "step" if steps == 1 else "steps"
-        cell_word = "cell" if steps == 1 else "cells"
-        direction = task_data["direction"]
-        
-        # Get direction descriptions
-        direction_description, direction_name = DIRECTION_DESCRIPTIONS.get(
-            direction, ("unknown", "unknown")
-        )
-        
-        # Extract additional task data with defaults
-        grid_size = task_data.get("grid_size", 6)
-        num_blocks = task_data.get("num_blocks", 3)
-        color = task_data.get("color", "colored")
-        
-        return template.format(
-            grid_size=grid_size,
-            num_blocks=num_blocks,
-            color=color,
-            steps=steps,
-            step_word=step_word,
-            cell_word=cell_word,
-            direction=direction,
-            direction_description=direction_description,
-            direction_name=direction_name
+        # Format prompt with task-specific values (memoized per parameter set)
+        template_index = rng.randrange(len(PROMPT_TEMPLATES))
+        return _format_prompt(
+            template_index,
+            task_data.get("grid_size", 6),
+            task_data.get("num_blocks", 3),
+            task_data.get("color", "colored"),
+            task_data["direction"],
+            task_data["steps"],
         )
     else:
         # Fallback to default prompts
         prompts = PROMPTS.get(task_type, PROMPTS["default"])
-        return random.choice(prompts)
+        return rng.choice(prompts)
 
 
 def get_all_prompts(task_type: str = "default") -> list[str]: